@@ -3,15 +3,16 @@
 from __future__ import annotations
 
 import hashlib
-import json
 import logging
 import secrets
-import traceback
+import socket
+import time
 from base64 import b64decode
 from collections.abc import Callable
 from datetime import datetime
 from typing import Any, Mapping
 
+import orjson
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ServiceValidationError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
@@ -47,6 +48,7 @@ _LOGGER = logging.getLogger(__name__)
 
 ZENDURE_MANAGER_STORAGE_VERSION = 1
 ZENDURE_DEVICES = "devices"
+ZENDURE_API_CACHE_TTL = 300  # Seconds the config flow keeps its deviceList reply for the entry setup
 
 
 class Api:
@@ -85,6 +87,7 @@ class Api:
     localPassword: str = ""
     wifipsw: str = ""
     wifissid: str = ""
+    apiCache: tuple[bytes, float, dict[str, Any]] | None = None
 
     def Init(self, data: Mapping[str, Any], mqtt: Mapping[str, Any]) -> None:
         """Initialize Zendure Api."""
@@ -111,11 +114,21 @@ class Api:
     @staticmethod
     async def Connect(hass: HomeAssistant, data: dict[str, Any], reload: bool) -> dict[str, Any] | None:
         """Connect to the Zendure API."""
-        try:
-            devices = await Api.ApiHA(hass, data)
-        except Exception:  # pylint: disable=broad-except
-            _LOGGER.error("Failed to connect to Zendure API")
-            return None
+        # only keep a digest of the token in the cache
+        token = hashlib.blake2b(str(data.get(CONF_APPTOKEN)).encode(), digest_size=16).digest()
+        cache, Api.apiCache = Api.apiCache, None
+        if cache is not None and cache[0] == token and time.monotonic() - cache[1] < ZENDURE_API_CACHE_TTL:
+            # use the reply of the config flow validation once, for the entry setup that follows it
+            devices: dict[str, Any] | None = cache[2]
+        else:
+            try:
+                devices = await Api.ApiHA(hass, data)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.error("Failed to connect to Zendure API")
+                return None
+            # a setup or reload always asks again, so devices added in the app are picked up
+            if not reload and devices:
+                Api.apiCache = (token, time.monotonic(), devices)
 
         # Open the storage
         if reload:
@@ -189,9 +202,8 @@ class Api:
                 return None
             return dict(result)
 
-        except Exception as e:
-            _LOGGER.error("Unable to connect to Zendure %s!", e)
-            _LOGGER.error(traceback.format_exc())
+        except Exception:
+            _LOGGER.exception("Unable to connect to Zendure!")
             return None
 
     def mqttInit(self, client: mqtt_client.Client, srv: str, port: str, user: str, psw: str) -> None:
@@ -208,16 +220,22 @@ class Api:
 
     def mqttConnect(self, client: Any, userdata: Any, _flags: Any, rc: Any, _props: Any) -> None:
         _LOGGER.info("Client %s connected to MQTT broker, return code: %s", userdata, rc)
+
+        # send the small property writes right away instead of waiting for Nagle
+        if (sock := client.socket()) is not None:
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            except OSError as err:
+                _LOGGER.debug("Unable to set TCP_NODELAY for %s: %s", userdata, err)
+
         if userdata == "zendure":
             for device in self.devices.values():
                 if client == device.zendure:
-                    client.subscribe(f"iot/{device.prodkey}/{device.deviceId}/#")
-                    Api.mqttCloud.unsubscribe(f"/{device.prodkey}/{device.deviceId}/#")
-                    Api.mqttCloud.unsubscribe(f"iot/{device.prodkey}/{device.deviceId}/#")
-        else:
-            for device in self.devices.values():
-                client.subscribe(f"/{device.prodkey}/{device.deviceId}/#")
-                client.subscribe(f"iot/{device.prodkey}/{device.deviceId}/#")
+                    client.subscribe(device.topic_subscribe[1])
+                    Api.mqttCloud.unsubscribe(device.topic_subscribe)
+        elif topics := [(topic, 0) for device in self.devices.values() for topic in device.topic_subscribe]:
+            # subscribe to the topics of all devices in a single request
+            client.subscribe(topics)
 
     def mqttDisconnect(self, _client: Any, userdata: Any, _flags: Any, rc: Any, _props: Any) -> None:
         _LOGGER.info("Client %s disconnected to MQTT broker, return code: %s", userdata, rc)
@@ -237,23 +255,20 @@ class Api:
 
             if (device := self.devices.get(deviceId, None)) is not None:
                 try:
-                    payload = json.loads(msg.payload.decode())
-                except json.JSONDecodeError as err:
+                    payload = orjson.loads(msg.payload)
+                except orjson.JSONDecodeError as err:
                     _LOGGER.error("Failed to decode JSON from device %s: %s", deviceId, err)
                     return
-                except UnicodeDecodeError as err:
-                    _LOGGER.error("Failed to decode payload encoding from device %s: %s", deviceId, err)
-                    return
 
                 if "isHA" in payload:
                     return
 
-                if self.mqttLogging:
+                if self.mqttLogging and _LOGGER.isEnabledFor(logging.INFO):
                     _LOGGER.info("Topic: %s => %s", msg.topic.replace(device.deviceId, device.name).replace(device.snNumber, "snxxx"), payload)
 
                 if device.mqttMessage(topics[3], payload) and device.mqtt != client:
                     device.mqtt = client
-                    device.setStatus()
+                    device.hass.loop.call_soon_threadsafe(device.setStatus)
 
         except Exception:
             _LOGGER.exception("Unexpected error in MQTT cloud message handler")
@@ -273,24 +288,21 @@ class Api:
 
             if (device := self.devices.get(deviceId, None)) is not None:
                 try:
-                    payload = json.loads(msg.payload.decode())
-                except json.JSONDecodeError as err:
+                    payload = orjson.loads(msg.payload)
+                except orjson.JSONDecodeError as err:
                     _LOGGER.error("Failed to decode JSON from local device %s: %s", deviceId, err)
                     return
-                except UnicodeDecodeError as err:
-                    _LOGGER.error("Failed to decode local payload encoding from device %s: %s", deviceId, err)
-                    return
 
                 if "isHA" in payload:
                     return
 
-                if self.mqttLogging:
+                if self.mqttLogging and _LOGGER.isEnabledFor(logging.INFO):
                     _LOGGER.info("Local topic: %s => %s", msg.topic.replace(device.deviceId, device.name).replace(device.snNumber, "snxxx"), payload)
 
                 if device.mqttMessage(topics[3], payload):
                     if device.mqtt != client:
                         device.mqtt = client
-                        device.setStatus()
+                        device.hass.loop.call_soon_threadsafe(device.setStatus)
 
                     if device.zendure is None:
                         psw = hashlib.md5(device.deviceId.encode()).hexdigest().upper()[8:24]  # noqa: S324
@@ -299,7 +311,7 @@ class Api:
 
                     if device.zendure is not None and device.zendure.is_connected():
                         payload["isHA"] = True
-                        device.zendure.publish(msg.topic, json.dumps(payload, default=lambda o: o.__dict__))
+                        device.zendure.publish(msg.topic, orjson.dumps(payload, default=vars))
             else:
                 _LOGGER.debug("Local message from unknown device %s: %s", msg.topic, deviceId)
 
@@ -317,4 +329,4 @@ class Api:
                 self.mqttLocal.publish(msg.topic, msg.payload)
 
         except Exception as err:
-            _LOGGER.error(err)
+            _LOGGER.error("Error forwarding device message %s: %s", msg.topic, err)
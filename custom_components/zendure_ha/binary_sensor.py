@@ -13,6 +13,9 @@ from .entity import EntityDevice, EntityZendure
 
 _LOGGER = logging.getLogger(__name__)
 
+# descriptions are frozen, so all devices can share them
+_DESCRIPTIONS: dict[tuple[str, Any], BinarySensorEntityDescription] = {}
+
 
 async def async_setup_entry(_hass: HomeAssistant, _config_entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
     """Set up the Zendure binary_sensor."""
@@ -31,21 +34,30 @@ class ZendureBinarySensor(EntityZendure, BinarySensorEntity):
     ) -> None:
         """Initialize a binary sensor entity."""
         super().__init__(device, uniqueid, "binary_sensor")
-        self.entity_description = BinarySensorEntityDescription(key=uniqueid, name=uniqueid, device_class=deviceclass)
+        if (desc := _DESCRIPTIONS.get((uniqueid, deviceclass))) is None:
+            desc = _DESCRIPTIONS[uniqueid, deviceclass] = BinarySensorEntityDescription(key=uniqueid, name=uniqueid, device_class=deviceclass)
+        self.entity_description = desc
         self._attr_is_on = False
         self._value_template: Template | None = template
+        self._render = template.async_render_with_possible_json_value if template is not None else None
         self.add([self])
 
     def update_value(self, value: Any) -> bool:
         try:
-            is_on = bool(int(self._value_template.async_render_with_possible_json_value(value, None)) != 0 if self._value_template is not None else int(value) != 0)
+            if self._render is not None:
+                is_on = int(self._render(value, None)) != 0
+            elif isinstance(value, (int, bool)):
+                # mqtt values are mostly ints already, no need to convert them
+                is_on = value != 0
+            else:
+                is_on = int(value) != 0
 
             if self._attr_is_on == is_on:
                 return False
 
             self._attr_is_on = is_on
-            if self.hass and self.hass.loop.is_running():
-                self.schedule_update_ha_state()
+            if self.hass is not None:
+                self.async_write_ha_state()
         except Exception as err:
             _LOGGER.error("Error %s setting state: %s => %s", err, self._attr_unique_id, value)
 
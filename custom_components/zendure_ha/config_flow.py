@@ -31,6 +31,8 @@ from .manager import ZendureConfigEntry
 
 _LOGGER = logging.getLogger(__name__)
 
+PASSWORD_SELECTOR = selector.TextSelector(selector.TextSelectorConfig(type=selector.TextSelectorType.PASSWORD))
+
 
 class ZendureConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Zendure Integration."""
@@ -51,24 +53,17 @@ class ZendureConfigFlow(ConfigFlow, domain=DOMAIN):
             vol.Required(CONF_MQTTSERVER): str,
             vol.Required(CONF_MQTTPORT, default=1883): int,
             vol.Required(CONF_MQTTUSER): str,
-            vol.Optional(CONF_MQTTPSW): selector.TextSelector(
-                selector.TextSelectorConfig(
-                    type=selector.TextSelectorType.PASSWORD,
-                ),
-            ),
+            vol.Optional(CONF_MQTTPSW): PASSWORD_SELECTOR,
             vol.Optional(CONF_AUTO_MQTT_USER, default=False): bool,
             vol.Optional(CONF_WIFISSID): str,
-            vol.Optional(CONF_WIFIPSW): selector.TextSelector(
-                selector.TextSelectorConfig(
-                    type=selector.TextSelectorType.PASSWORD,
-                ),
-            ),
+            vol.Optional(CONF_WIFIPSW): PASSWORD_SELECTOR,
         }
     )
 
     def __init__(self) -> None:
         """Initialize."""
         self._user_input: dict[str, Any] = {}
+        self._entry: ZendureConfigEntry | None = None
 
     async def async_step_user(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
         """Step when user initializes a integration."""
@@ -97,7 +92,7 @@ class ZendureConfigFlow(ConfigFlow, domain=DOMAIN):
         errors: dict[str, str] = {}
         if user_input is not None and user_input.get(CONF_MQTTSERVER, None) is not None:
             try:
-                self._user_input = self._user_input | user_input if self._user_input else user_input
+                self._user_input.update(user_input)
                 if await Api.Connect(self.hass, self._user_input, False) is None:
                     errors["base"] = "invalid input"
             except Exception as err:  # pylint: disable=broad-except
@@ -113,10 +108,11 @@ class ZendureConfigFlow(ConfigFlow, domain=DOMAIN):
         """Add reconfigure step to allow to reconfigure a config entry."""
         errors: dict[str, str] = {}
 
-        entry = self._get_reconfigure_entry()
+        if (entry := self._entry) is None:
+            entry = self._entry = self._get_reconfigure_entry()
         schema = self.data_schema
         if user_input is not None:
-            self._user_input = self._user_input | user_input
+            self._user_input.update(user_input)
             use_mqtt = user_input.get(CONF_MQTTLOCAL, False)
             if use_mqtt:
                 schema = self.mqtt_schema
@@ -135,10 +131,7 @@ class ZendureConfigFlow(ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(
             step_id="reconfigure",
-            data_schema=self.add_suggested_values_to_schema(
-                data_schema=schema,
-                suggested_values=entry.data | (user_input or {}),
-            ),
+            data_schema=self.add_suggested_values_to_schema(schema, {**entry.data, **user_input} if user_input else entry.data),
             errors=errors,
         )
 
@@ -152,25 +145,26 @@ class ZendureConfigFlow(ConfigFlow, domain=DOMAIN):
 class ZendureOptionsFlowHandler(OptionsFlow):
     """Handles the options flow."""
 
+    options_schema = vol.Schema(
+        {
+            vol.Required(CONF_P1METER): str,
+            vol.Required(CONF_MQTTLOG): bool,
+            vol.Optional(CONF_AUTO_MQTT_USER, default=False): bool,
+            vol.Optional(CONF_SIM, default=False): bool,
+        }
+    )
+
     async def async_step_init(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
         """Handle options flow."""
         if user_input is not None:
-            data = self.config_entry.data | user_input
+            data = dict(self.config_entry.data)
+            data.update(user_input)
             self.hass.config_entries.async_update_entry(self.config_entry, data=data)
             return self.async_create_entry(title="", data=data)
 
-        options_schema = vol.Schema(
-            {
-                vol.Required(CONF_P1METER, default=self.config_entry.data[CONF_P1METER]): str,
-                vol.Required(CONF_MQTTLOG, default=self.config_entry.data[CONF_MQTTLOG]): bool,
-                vol.Optional(CONF_AUTO_MQTT_USER, default=self.config_entry.data.get(CONF_AUTO_MQTT_USER, False)): bool,
-                vol.Optional(CONF_SIM, default=self.config_entry.data.get(CONF_SIM, False)): bool,
-            }
-        )
-
         return self.async_show_form(
             step_id="init",
-            data_schema=self.add_suggested_values_to_schema(options_schema, self.config_entry.data),
+            data_schema=self.add_suggested_values_to_schema(self.options_schema, self.config_entry.data),
         )
 
 
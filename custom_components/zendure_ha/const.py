@@ -57,8 +57,8 @@ class SmartMode:
     ZENSDK = 2
     CONNECTED = 10
 
-    TIMEFAST = 2.2  # Fast update interval after significant change
-    TIMEZERO = 4  # Normal update interval
+    TIMEFAST = timedelta(seconds=2.2)  # Fast update interval after significant change
+    TIMEZERO = timedelta(seconds=4)  # Normal update interval
 
     # Standard deviation thresholds for detecting significant changes
     P1_STDDEV_FACTOR = 3.5  # Multiplier for P1 meter stddev calculation
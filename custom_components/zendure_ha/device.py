@@ -5,11 +5,12 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-import traceback
+import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any
 
+import orjson
 from aiohttp import ClientTimeout
 from bleak import BleakClient
 from bleak.exc import BleakError
@@ -38,45 +39,37 @@ _LOGGER = logging.getLogger(__name__)
 
 CONST_HEADER = {"content-type": "application/json; charset=UTF-8"}
 CONST_TIMEOUT = ClientTimeout(total=4)
+CONST_WRITE_DELAY = 0.05  # Seconds to collect property writes into one message
+CONST_LASTSEEN = 300  # Seconds a device counts as seen after its last report
 SF_COMMAND_CHAR = "0000c304-0000-1000-8000-00805f9b34fb"
 
+# Battery model and capacity (kWh) by the first character of the serial number
+BATTERY_TYPES: dict[str, tuple[str, float]] = {
+    "A": ("AB1000", 0.96),
+    "B": ("AB1000S", 0.96),
+    "C": ("AB2000", 1.92),
+    "F": ("AB3000", 2.88),
+    "G": ("AB3000L", 2.88),
+    # JO2A => internal battery of SF2400AC pro
+    # JO4A => internal battery of SF2400AC+
+    "J": ("I2400", 2.4),
+}
+
+# Models which also depend on the fourth character of the serial number
+# External AB2000X and internal AB2000X of SF800+/SF800Pro/SF1600AC+ starting with CO4A. They are also described as additional battery in the Zendure App, even when they are integrated into the device.
+BATTERY_SUBTYPES: dict[str, tuple[str, float]] = {
+    "A3": ("AIO2400", 2.4),
+    "CE": ("AB2000X", 1.92),
+    "CF": ("AB2000S", 1.92),
+}
+
 
 class ZendureBattery(EntityDevice):
     """Zendure Battery class for devices."""
 
     @staticmethod
     def get_battery_type(sn: str) -> tuple[str, str, float]:
-        model = "???"
-        match sn[0]:
-            case "A":
-                if sn[3] == "3":
-                    model = "AIO2400"
-                    kWh = 2.4
-                else:
-                    model = "AB1000"
-                    kWh = 0.96
-            case "B":
-                model = "AB1000S"
-                kWh = 0.96
-            case "C":
-                # External AB2000X and internal AB2000X of SF800+/SF800Pro/SF1600AC+ starting with CO4A. They are also described as additional battery in the Zendure App, even when they are integrated into the device.
-                model = "AB2000" + ("S" if sn[3] == "F" else "X" if sn[3] == "E" else "")
-                kWh = 1.92
-            case "F":
-                model = "AB3000"
-                kWh = 2.88
-            case "G":
-                model = "AB3000L"
-                kWh = 2.88
-            case "J":
-                # JO2A => internal battery of SF2400AC pro
-                # JO4A => internal battery of SF2400AC+
-                model = "I2400"
-                kWh = 2.4
-            case _:
-                model = "Unknown"
-                kWh = 0.0
-
+        model, kWh = BATTERY_SUBTYPES.get(sn[:1] + sn[3:4]) or BATTERY_TYPES.get(sn[:1], ("Unknown", 0.0))
         name = f"{model} {sn[-5:]}".strip()
         return name, model, kWh
 
@@ -96,22 +89,28 @@ class ZendureDevice(EntityDevice):
 
         """Initialize Device."""
         self.prodkey = definition["productKey"]
-        super().__init__(hass, deviceId, name, model, self.prodkey, definition["snNumber"], parent)
         self.snNumber = definition["snNumber"]
+        super().__init__(hass, deviceId, name, model, self.prodkey, self.snNumber, parent)
         self.definition = definition
         self.fuseGrp: FuseGroup
 
         self.mqtt: mqtt_client.Client | None = None
         self.zendure: mqtt_client.Client | None = None
-        self.ipAddress = definition.get("ip", "") if definition.get("ip", "") != "" else f"zendure-{definition['productModel'].replace(' ', '')}-{self.snNumber}.local"
+        self.ipAddress = ip if (ip := definition.get("ip", "")) != "" else f"zendure-{definition['productModel'].replace(' ', '')}-{self.snNumber}.local"
 
         self.topic_read = f"iot/{self.prodkey}/{self.deviceId}/properties/read"
         self.topic_write = f"iot/{self.prodkey}/{self.deviceId}/properties/write"
         self.topic_function = f"iot/{self.prodkey}/{self.deviceId}/function/invoke"
+        self.topic_replay = f"iot/{self.prodkey}/{self.deviceId}/register/replay"
+        self.topic_subscribe = [f"/{self.prodkey}/{self.deviceId}/#", f"iot/{self.prodkey}/{self.deviceId}/#"]
 
-        self.batteries: dict[str, ZendureBattery | None] = {}
-        self.lastseen = datetime.min
+        self.batteries: dict[str, ZendureBattery] = {}
+        self.batteryData: dict[str, dict[str, Any]] = {}
+        self.lastValues: dict[str, Any] = {}
+        self.lastseen = 0.0  # time.monotonic() deadline, 0 when not seen
         self._messageid = 0
+        self.writeProps: dict[str, Any] = {}
+        self.writeHandle: asyncio.TimerHandle | None = None
         self.kWh = 0.0
 
         self.charge_limit: int = 0
@@ -185,7 +184,7 @@ class ZendureDevice(EntityDevice):
         from .api import Api
 
         try:
-            if self.lastseen == datetime.min:
+            if self.lastseen == 0:
                 self.connectionStatus.update_value(0)
             elif self.socStatus.asInt == 1:
                 self.connectionStatus.update_value(1)
@@ -202,7 +201,7 @@ class ZendureDevice(EntityDevice):
         except Exception:
             self.connectionStatus.update_value(0)
 
-    def entityUpdate(self, key: Any, value: Any) -> bool:
+    def entityUpdate(self, key: Any, value: Any, now: datetime | None = None) -> bool:
         # update entity state
         if key in {"remainOutTime", "remainInputTime"}:
             self.remainingTime.update_value(self.calcRemainingTime())
@@ -211,27 +210,29 @@ class ZendureDevice(EntityDevice):
         changed = super().entityUpdate(key, value)
         try:
             if changed:
+                if now is None:
+                    now = dt_util.now()
                 match key:
                     case "packState":
                         if value == 0:
                             self.aggrSwitchCount.update_value(1 + self.aggrSwitchCount.asNumber)
                     case "outputPackPower":
                         if not self.heatState.is_on:
-                            self.aggrCharge.aggregate(dt_util.now(), value)
-                        self.aggrDischarge.aggregate(dt_util.now(), 0)
+                            self.aggrCharge.aggregate(now, value)
+                        self.aggrDischarge.aggregate(now, 0)
                         self.batInOut.update_value(self.batteryOutput.asInt - self.batteryInput.asInt)
                     case "packInputPower":
-                        self.aggrCharge.aggregate(dt_util.now(), 0)
-                        self.aggrDischarge.aggregate(dt_util.now(), value)
+                        self.aggrCharge.aggregate(now, 0)
+                        self.aggrDischarge.aggregate(now, value)
                         self.batInOut.update_value(self.batteryOutput.asInt - self.batteryInput.asInt)
                     case "solarInputPower":
-                        self.aggrSolar.aggregate(dt_util.now(), value)
+                        self.aggrSolar.aggregate(now, value)
                     case "gridInputPower":
-                        self.aggrHomeInput.aggregate(dt_util.now(), value)
+                        self.aggrHomeInput.aggregate(now, value)
                     case "outputHomePower":
-                        self.aggrHomeOut.aggregate(dt_util.now(), value)
+                        self.aggrHomeOut.aggregate(now, value)
                     case "gridOffPower":
-                        self.aggrOffGrid.aggregate(dt_util.now(), value)
+                        self.aggrOffGrid.aggregate(now, value)
                     case "inverseMaxPower":
                         self.setLimits(self.charge_limit, value)
                     case "chargeLimit" | "chargeMaxLimit":
@@ -239,14 +240,13 @@ class ZendureDevice(EntityDevice):
                     case "hemsState" | "socStatus":
                         self.setStatus()
                         if key == "socStatus" and self.socStatus.asInt == 0:
-                            self.nextCalibration.update_value(dt_util.now() + timedelta(days=30))
+                            self.nextCalibration.update_value(now + timedelta(days=30))
                     case "electricLevel" | "minSoc" | "socLimit":
                         if self.electricLevel.asInt == 100:
-                            self.nextCalibration.update_value(dt_util.now() + timedelta(days=30))
+                            self.nextCalibration.update_value(now + timedelta(days=30))
                         self.availableKwh.update_value((self.electricLevel.asNumber - self.minSoc.asNumber) / 100 * self.kWh)
-        except Exception as e:
-            _LOGGER.error("EntityUpdate error %s %s %s!", self.name, key, e)
-            _LOGGER.error(traceback.format_exc())
+        except Exception:
+            _LOGGER.exception("EntityUpdate error %s %s!", self.name, key)
 
         return changed
 
@@ -271,15 +271,27 @@ class ZendureDevice(EntityDevice):
             return
 
         _LOGGER.info("Writing property %s %s => %s", self.name, entity.propertyName, value)
+        # the entity may show the written value now, so apply the next report again
+        self.lastValues.pop(entity.propertyName, None)
+
+        # collect writes arriving together (scenes, automations) into one message
+        self.writeProps[entity.propertyName] = value
+        if self.writeHandle is None:
+            self.writeHandle = self.hass.loop.call_later(CONST_WRITE_DELAY, self.writeFlush)
+
+    def writeFlush(self) -> None:
+        """Write the collected properties in one message."""
+        self.writeHandle = None
+        properties, self.writeProps = self.writeProps, {}
         self._messageid += 1
-        payload = json.dumps(
+        payload = orjson.dumps(
             {
                 "deviceId": self.deviceId,
                 "messageId": self._messageid,
-                "timestamp": int(datetime.now().timestamp()),
-                "properties": {entity.propertyName: value},
+                "timestamp": int(time.time()),
+                "properties": properties,
             },
-            default=lambda o: o.__dict__,
+            default=vars,
         )
         if self.mqtt is not None:
             self.mqtt.publish(self.topic_write, payload)
@@ -287,34 +299,40 @@ class ZendureDevice(EntityDevice):
     async def button_press(self, _key: str) -> None:
         return
 
-    def mqttPublish(self, topic: str, command: Any, client: mqtt_client.Client | None = None) -> None:
+    def mqttPublish(self, topic: str, command: Any, *clients: mqtt_client.Client | None) -> None:
         command["messageId"] = self._messageid
         command["deviceId"] = self.deviceId
-        command["timestamp"] = int(datetime.now().timestamp())
-        payload = json.dumps(command, default=lambda o: o.__dict__)
+        command["timestamp"] = int(time.time())
+        payload = orjson.dumps(command, default=vars)
 
-        if client is not None:
-            client.publish(topic, payload)
-        elif self.mqtt is not None:
-            self.mqtt.publish(topic, payload)
+        for client in clients or (self.mqtt,):
+            if client is not None:
+                client.publish(topic, payload)
 
     def mqttInvoke(self, command: Any) -> None:
         self._messageid += 1
         command["messageId"] = self._messageid
         command["deviceKey"] = self.deviceId
-        command["timestamp"] = int(datetime.now().timestamp())
         self.mqttPublish(self.topic_function, command)
 
-    async def mqttProperties(self, payload: Any) -> None:
-        if self.lastseen == datetime.min:
-            self.lastseen = datetime.now() + timedelta(minutes=5)
+    def mqttProperties(self, payload: Any) -> None:
+        """Apply a properties report, runs in the event loop."""
+        firstseen = self.lastseen == 0
+        self.lastseen = time.monotonic() + CONST_LASTSEEN
+        if firstseen:
             self.setStatus()
-        else:
-            self.lastseen = datetime.now() + timedelta(minutes=5)
 
-        if (properties := payload.get("properties", None)) and len(properties) > 0:
+        if properties := payload.get("properties"):
+            # use a single timestamp for all aggregations in this report
+            now = dt_util.now()
+            values = self.lastValues
             for key, value in properties.items():
-                self.entityUpdate(key, value)
+                # most properties are reported unchanged, skip rendering and comparing those again
+                if key in values and values[key] == value:
+                    continue
+                self.entityUpdate(key, value, now)
+                if (entity := self.entities.get(key)) is not None and entity.platform is not None:
+                    values[key] = value
 
         # update the battery properties
         if batprops := payload.get("packData", None):
@@ -322,17 +340,25 @@ class ZendureDevice(EntityDevice):
                 if (sn := b.get("sn", None)) is None:
                     continue
 
-                if (bat := self.batteries.get(sn, None)) is None:
+                if (bat := self.batteries.get(sn)) is None:
                     self.batteries[sn] = ZendureBattery(self.hass, sn, self)
+                    self.batteryData.pop(sn, None)
 
-                elif bat and b:
+                elif b != self.batteryData.get(sn):
+                    # reports often repeat the pack data unchanged, skip those
                     for key, value in b.items():
                         if key != "sn":
                             bat.entityUpdate(key, value)
 
+                    # only remember the pack data once all its entities are registered, before that it has to be applied again
+                    if all((entity := bat.entities.get(key)) is None or entity is bat.empty or entity.platform is not None for key in b):
+                        self.batteryData[sn] = b
+                    else:
+                        self.batteryData.pop(sn, None)
+
             # Recalculate total capacity after every packData update
             # (covers both new batteries and potential pack changes)
-            self.kWh = sum(0 if b is None else b.kWh for b in self.batteries.values())
+            self.kWh = sum(b.kWh for b in self.batteries.values())
             self.totalKwh.update_value(self.kWh)
             self.availableKwh.update_value((self.electricLevel.asNumber - self.minSoc.asNumber) / 100 * self.kWh)
 
@@ -340,21 +366,18 @@ class ZendureDevice(EntityDevice):
         try:
             match topic:
                 case "properties/report":
-                    asyncio.run_coroutine_threadsafe(self.mqttProperties(payload), self.hass.loop)
-                    # self.mqttProperties(payload)
+                    self.hass.loop.call_soon_threadsafe(self.mqttProperties, payload)
 
                 case "register/replay":
                     _LOGGER.info("Register replay for %s => %s", self.name, payload)
                     if self.mqtt is not None:
-                        self.mqtt.publish(f"iot/{self.prodkey}/{self.deviceId}/register/replay", None, 1, True)
+                        self.mqtt.publish(self.topic_replay, None, 1, True)
 
                 case "time-sync":
                     return True
 
                 case "properties/energy":
-                    self.hemsState.update_value(1)
-                    self.hemsStateUpdated = datetime.now()
-                    self.setStatus()
+                    self.hass.loop.call_soon_threadsafe(self.hemsUpdate)
                     return True
 
                 case "event/device" | "event/error":
@@ -368,19 +391,28 @@ class ZendureDevice(EntityDevice):
                 case _:
                     return False
         except Exception as err:
-            _LOGGER.error(err)
+            _LOGGER.error("Error handling mqtt message %s for %s: %s", topic, self.name, err)
 
         return True
 
+    def hemsUpdate(self) -> None:
+        """Mark the HEMS state as active, runs in the event loop."""
+        self.hemsState.update_value(1)
+        self.hemsStateUpdated = datetime.now()
+        self.lastValues.pop("hemsState", None)
+        self.setStatus()
+
     async def mqttSelect(self, _select: ZendureRestoreSelect, _value: Any) -> None:
         from .api import Api
 
+        client = Api.mqttCloud if self.connection.value == 0 else Api.mqttLocal if self.connection.value == 1 else None
+        if client is not None and client is self.mqtt:
+            # already reporting through the selected broker, the mqttReset button forces a new BLE setup
+            return
+
         self.mqtt = None
-        if self.lastseen != datetime.min:
-            if self.connection.value == 0:
-                await self.bleMqtt(Api.mqttCloud)
-            elif self.connection.value == 1:
-                await self.bleMqtt(Api.mqttLocal)
+        if self.lastseen != 0 and client is not None:
+            await self.bleMqtt(client)
 
         _LOGGER.debug("Mqtt selected %s", self.name)
 
@@ -582,25 +614,26 @@ class ZendureDevice(EntityDevice):
         try:
             self._messageid += 1
             payload = json.dumps(command, default=lambda o: o.__dict__)
-            b = bytearray()
-            b.extend(map(ord, payload))
             _LOGGER.info("BLE command: %s => %s", self.name, payload)
-            await client.write_gatt_char(SF_COMMAND_CHAR, b, response=False)
+            await client.write_gatt_char(SF_COMMAND_CHAR, payload.encode(), response=False)
         except Exception as err:
             _LOGGER.warning("BLE error: %s", err)
 
     async def power_get(self) -> bool:
-        if self.lastseen < datetime.now():
-            self.lastseen = datetime.min
+        if self.lastseen < time.monotonic():
+            self.lastseen = 0
             self.setStatus()
 
         self.actualKwh = self.availableKwh.asNumber
 
-        if not self.online or self.socSet.asNumber == 0 or self.kWh == 0:
+        socSet = self.socSet.asNumber
+        socLimit = self.socLimit.asInt
+        level = self.electricLevel.asInt
+        if not self.online or socSet == 0 or self.kWh == 0:
             self.state = DeviceState.OFFLINE
-        elif self.socLimit.asInt == SmartMode.SOCFULL or self.electricLevel.asInt >= self.socSet.asNumber:
+        elif socLimit == SmartMode.SOCFULL or level >= socSet:
             self.state = DeviceState.SOCFULL
-        elif self.socLimit.asInt == SmartMode.SOCEMPTY or self.electricLevel.asInt <= self.minSoc.asNumber:
+        elif socLimit == SmartMode.SOCEMPTY or level <= self.minSoc.asNumber:
             self.state = DeviceState.SOCEMPTY
         else:
             self.state = DeviceState.INACTIVE
@@ -672,11 +705,10 @@ class ZendureLegacy(ZendureDevice):
         """Refresh the device data."""
         from .api import Api
 
-        if self.lastseen != datetime.min:
+        if self.lastseen != 0:
             self.mqttPublish(self.topic_read, {"properties": ["getAll"]}, self.mqtt)
         else:
-            self.mqttPublish(self.topic_read, {"properties": ["getAll"]}, Api.mqttCloud)
-            self.mqttPublish(self.topic_read, {"properties": ["getAll"]}, Api.mqttLocal)
+            self.mqttPublish(self.topic_read, {"properties": ["getAll"]}, Api.mqttCloud, Api.mqttLocal)
 
     def mqttMessage(self, topic: str, payload: Any) -> bool:
         if topic == "register/replay":
@@ -695,6 +727,7 @@ class ZendureZenSdk(ZendureDevice):
         super().__init__(hass, deviceId, name, model, definition, parent)
         self.connection = ZendureRestoreSelect(self, "connection", {0: "cloud", 2: "zenSDK"}, self.mqttSelect, 0)
         self.httpid = 0
+        self.writeTask: asyncio.Task | None = None
 
     async def mqttSelect(self, select: Any, _value: Any) -> None:
         from .api import Api
@@ -702,36 +735,43 @@ class ZendureZenSdk(ZendureDevice):
         self.mqtt = None
         match select.value:
             case 0:
-                Api.mqttCloud.unsubscribe(f"/{self.prodkey}/{self.deviceId}/#")
-                Api.mqttCloud.unsubscribe(f"iot/{self.prodkey}/{self.deviceId}/#")
+                Api.mqttCloud.unsubscribe(self.topic_subscribe)
 
             case 2:
-                Api.mqttCloud.unsubscribe(f"/{self.prodkey}/{self.deviceId}/#")
-                Api.mqttCloud.unsubscribe(f"iot/{self.prodkey}/{self.deviceId}/#")
+                Api.mqttCloud.unsubscribe(self.topic_subscribe)
 
         _LOGGER.debug("Mqtt selected %s", self.name)
 
-    async def entityWrite(self, entity: EntityZendure, value: Any) -> None:
-        if entity.translation_key is None:
-            _LOGGER.error("Entity %s has no translation_key, cannot write property %s", entity.name, self.name)
+    def writeFlush(self) -> None:
+        """Write the collected properties via mqtt or the local api."""
+        if self.online and self.connection.value == 0:
+            super().writeFlush()
             return
 
-        if self.online and self.connection.value == 0:
-            await super().entityWrite(entity, value)
-        else:
-            _LOGGER.info("Writing property %s %s => %s", self.name, entity.propertyName, value)
-            await self.httpPost("properties/write", {"properties": {entity.propertyName: value}})
+        self.writeHandle = None
+        if self.writeTask is None:
+            self.writeTask = self.hass.async_create_task(self.writePost())
+
+    async def writePost(self) -> None:
+        """Post the collected properties, one request at a time."""
+        try:
+            # writes arriving during a post are sent with their latest value afterwards
+            while self.writeProps:
+                properties, self.writeProps = self.writeProps, {}
+                await self.httpPost("properties/write", {"properties": properties})
+        finally:
+            self.writeTask = None
 
     async def dataRefresh(self, update_count: int) -> None:
         if update_count == 0 and not self.online:
             json = await self.httpGet("properties/report")
-            await self.mqttProperties(json)
+            self.mqttProperties(json)
 
     async def power_get(self) -> bool:
         """Get the current power."""
         if self.connection.value != 0:
             json = await self.httpGet("properties/report")
-            await self.mqttProperties(json)
+            self.mqttProperties(json)
 
         return await super().power_get()
 
@@ -763,13 +803,13 @@ class ZendureZenSdk(ZendureDevice):
     async def httpGet(self, url: str, key: str | None = None) -> dict[str, Any]:
         try:
             url = f"http://{self.ipAddress}/{url}"
-            response = await self.session.get(url, headers=CONST_HEADER, timeout=CONST_TIMEOUT)
-            payload = json.loads(await response.text())
-            self.lastseen = datetime.now()
+            async with self.session.get(url, headers=CONST_HEADER, timeout=CONST_TIMEOUT) as response:
+                payload = orjson.loads(await response.read())
+            self.lastseen = time.monotonic()
             return payload if key is None else payload.get(key, {})
         except Exception as e:
             _LOGGER.error("%s for %s during httpGet%s", type(e).__name__, self.name, f": {e}" if str(e) else "!")
-            self.lastseen = datetime.min
+            self.lastseen = 0
         return {}
 
     async def httpPost(self, url: str, command: Any) -> bool:
@@ -778,10 +818,12 @@ class ZendureZenSdk(ZendureDevice):
             command["id"] = self.httpid
             command["sn"] = self.snNumber
             url = f"http://{self.ipAddress}/{url}"
-            await self.session.post(url, json=command, headers=CONST_HEADER, timeout=CONST_TIMEOUT)
+            async with self.session.post(url, data=orjson.dumps(command, default=vars), headers=CONST_HEADER, timeout=CONST_TIMEOUT) as response:
+                # read the reply, so the connection can be reused for the next request
+                await response.read()
         except Exception as e:
             _LOGGER.error("%s for %s during httpPost%s", type(e).__name__, self.name, f": {e}" if str(e) else "!")
-            self.lastseen = datetime.min
+            self.lastseen = 0
             return False
         return True
 
@@ -6,6 +6,7 @@ import json
 import logging
 import re
 import unicodedata
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -20,8 +21,10 @@ from homeassistant.helpers.template import Template
 from .const import DOMAIN
 
 
+@lru_cache(maxsize=1024)
 def snakecase(value: str) -> str:
     """Convert to snake_case with only HA-valid chars (a-z, 0-9, _)."""
+    # property names repeat for every device, so the conversion is cached
     # normalize unicode (e.g. ä -> a, é -> e)
     value = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode("ascii")
     # insert underscore before uppercase letters (camelCase -> camel_case)
@@ -33,6 +36,12 @@ def snakecase(value: str) -> str:
     return value
 
 
+@lru_cache(maxsize=64)
+def cached_template(hass: HomeAssistant, source: str) -> Template:
+    """Return a shared Template, so entities with the same source compile it only once."""
+    return Template(source, hass)
+
+
 _LOGGER = logging.getLogger(__name__)
 
 CONST_FACTOR = 2
@@ -59,9 +68,9 @@ class EntityZendure(Entity):
             return
         self.device = device
         self.propertyName = uniqueid
-        self._attr_unique_id = snakecase(f"{self.device.name.lower()}_{uniqueid}")
-        self.internal_integration_suggested_object_id = self._attr_unique_id
         self._attr_translation_key = snakecase(uniqueid)
+        self._attr_unique_id = "_".join(n for n in (device.snakeName, self._attr_translation_key) if n)
+        self.internal_integration_suggested_object_id = self._attr_unique_id
         device.entities[uniqueid] = self
         if domain and device.checkEntity is not None and self._attr_translation_key not in device.checkEntity:
             device.checkEntity[self._attr_translation_key] = domain
@@ -197,6 +206,7 @@ class EntityDevice:
         self.hass = hass
         self.deviceId = deviceId
         self.name = name or deviceId
+        self.snakeName = snakecase(self.name.lower())
         self.unique = "".join(self.name.split())
         self.entities: dict[str, EntityZendure] = {}
         self.sn = sn
@@ -215,7 +225,7 @@ class EntityDevice:
         device_registry = dr.async_get(self.hass)
         if di := device_registry.async_get_device(identifiers={(DOMAIN, sn)}):
             self.attr_device_info["connections"] = di.connections
-            self.check_entities(di, snakecase(self.name.lower()))
+            self.check_entities(di, self.snakeName)
 
         if parent is not None:
             self.attr_device_info["via_device"] = (DOMAIN, parent)
@@ -252,70 +262,10 @@ class EntityDevice:
     async def dataRefresh(self, _update_count: int) -> None:
         return
 
-    def entityUpdate(self, key: Any, value: Any) -> bool:  # noqa: PLR0915
-        from .binary_sensor import ZendureBinarySensor
-        from .select import ZendureSelect
-        from .sensor import ZendureCalcSensor, ZendureSensor
-        from .switch import ZendureSwitch
-
+    def entityUpdate(self, key: Any, value: Any) -> bool:
         # check if entity is already created
         if (entity := self.entities.get(key, None)) is None:
-            if info := self.createEntity.get(key, None):
-                match info if isinstance(info, str) else info[0]:
-                    case "W":
-                        entity = ZendureSensor(self, key, None, "W", "power", "measurement", None)
-                        if len(info) >= 3:
-                            entity.icon = info[2]
-                    case "V":
-                        factor = int(info[2]) if len(info) > CONST_FACTOR else 1
-                        entity = ZendureSensor(self, key, None, "V", "voltage", "measurement", 2, factor)
-                    case "%":
-                        if info[1] == "battery":
-                            entity = ZendureSensor(self, key, None, "%", "battery", "measurement", None)
-                        else:
-                            tmpl = Template(info[2], self.hass) if len(info) > CONST_FACTOR else None
-                            entity = ZendureSensor(self, key, tmpl, "%", info[1], "measurement", None)
-                    case "A":
-                        factor = int(info[2]) if len(info) > CONST_FACTOR else 1
-                        entity = ZendureSensor(self, key, None, "A", "current", "measurement", None, factor)
-                    case "h":
-                        tmpl = Template("{{ value | int / 60 }}", self.hass)
-                        entity = ZendureSensor(self, key, tmpl, "h", "duration", "measurement", None)
-                    case "°C":
-                        tmpl = Template("{{ (value | float - 2731) / 10 | round(1) }}", self.hass)
-                        entity = ZendureSensor(self, key, tmpl, "°C", "temperature", "measurement", None)
-                    case "dBm":
-                        entity = ZendureSensor(
-                            self,
-                            key,
-                            None,
-                            "dBm",
-                            "signal_strength",
-                            "measurement",
-                            None,
-                        )
-                    case "version":
-                        entity = ZendureCalcSensor(self, key)
-                        entity.calculate = entity.calculate_version
-                    case "binary":
-                        entity = ZendureBinarySensor(self, key, None, "switch")
-                    case "switch":
-                        entity = ZendureSwitch(self, key, self.entityWrite, None, "switch", value)
-                    case "none":
-                        self.entities[key] = entity = self.empty
-                    case "select":
-                        if isinstance(info[1], dict):
-                            options: Any = info[1]
-                            default: Any = 0 if len(info) == 2 else info[2]
-                            entity = ZendureSelect(self, key, options, self.entityWrite, default)
-                    case "template":
-                        tmpl = Template(info[1], self.hass)
-                        entity = ZendureSensor(self, key, tmpl, info[2], info[3], "measurement", None)
-                    case _:
-                        _LOGGER.debug("Create sensor %s %s with no unit", self.name, key)
-            else:
-                entity = ZendureSensor(self, key)
-
+            entity = self.entityCreate(key, value)
             if entity is not None and entity.platform is not None:
                 entity.update_value(value)
             return True
@@ -326,6 +276,71 @@ class EntityDevice:
 
         return False
 
+    def entityCreate(self, key: Any, value: Any) -> EntityZendure | None:  # noqa: PLR0915
+        """Create the entity for a new property."""
+        from .binary_sensor import ZendureBinarySensor
+        from .select import ZendureSelect
+        from .sensor import ZendureCalcSensor, ZendureSensor
+        from .switch import ZendureSwitch
+
+        entity: Any = None
+        if info := self.createEntity.get(key, None):
+            match info if isinstance(info, str) else info[0]:
+                case "W":
+                    entity = ZendureSensor(self, key, None, "W", "power", "measurement", None)
+                    if len(info) >= 3:
+                        entity.icon = info[2]
+                case "V":
+                    factor = int(info[2]) if len(info) > CONST_FACTOR else 1
+                    entity = ZendureSensor(self, key, None, "V", "voltage", "measurement", 2, factor)
+                case "%":
+                    if info[1] == "battery":
+                        entity = ZendureSensor(self, key, None, "%", "battery", "measurement", None)
+                    else:
+                        tmpl = cached_template(self.hass, info[2]) if len(info) > CONST_FACTOR else None
+                        entity = ZendureSensor(self, key, tmpl, "%", info[1], "measurement", None)
+                case "A":
+                    factor = int(info[2]) if len(info) > CONST_FACTOR else 1
+                    entity = ZendureSensor(self, key, None, "A", "current", "measurement", None, factor)
+                case "h":
+                    entity = ZendureSensor(self, key, None, "h", "duration", "measurement", None, 60)
+                case "°C":
+                    entity = ZendureCalcSensor(self, key, None, "°C", "temperature", "measurement")
+                    entity.calculate = entity.calculate_temperature
+                case "dBm":
+                    entity = ZendureSensor(
+                        self,
+                        key,
+                        None,
+                        "dBm",
+                        "signal_strength",
+                        "measurement",
+                        None,
+                    )
+                case "version":
+                    entity = ZendureCalcSensor(self, key)
+                    entity.calculate = entity.calculate_version
+                case "binary":
+                    entity = ZendureBinarySensor(self, key, None, "switch")
+                case "switch":
+                    entity = ZendureSwitch(self, key, self.entityWrite, None, "switch", value)
+                case "none":
+                    self.entities[key] = entity = self.empty
+                case "select":
+                    if isinstance(info[1], dict):
+                        options: Any = info[1]
+                        default: Any = 0 if len(info) == 2 else info[2]
+                        entity = ZendureSelect(self, key, options, self.entityWrite, default)
+                case "template":
+                    tmpl = cached_template(self.hass, info[1])
+                    entity = ZendureSensor(self, key, tmpl, info[2], info[3], "measurement", None)
+                case _:
+                    _LOGGER.debug("Create sensor %s %s with no unit", self.name, key)
+        else:
+            entity = ZendureSensor(self, key)
+
+        return entity
+
     def entityWrite(self, _entity: EntityZendure, _value: Any) -> None:
         return
 
@@ -12,6 +12,8 @@ _LOGGER = logging.getLogger(__name__)
 class FuseGroup:
     """Zendure Fuse Group."""
 
+    __slots__ = ("devices", "initPower", "maxpower", "minpower", "name")
+
     def __init__(self, name: str, maxpower: int, minpower: int, devices: list[ZendureDevice] | None = None) -> None:
         """Initialize the fuse group."""
         self.name: str = name
@@ -31,19 +33,20 @@ class FuseGroup:
             else:
                 limit = 0
                 weight = 0
+                active: list[tuple[ZendureDevice, int]] = []
                 for fd in self.devices:
                     if fd.homeInput.asInt > 0:
+                        active.append((fd, fd_weight := (100 - fd.electricLevel.asInt) * fd.charge_limit))
                         limit += fd.charge_limit
-                        weight += (100 - fd.electricLevel.asInt) * fd.charge_limit
+                        weight += fd_weight
                 avail = max(self.minpower, limit)
-                for fd in self.devices:
-                    if fd.homeInput.asInt > 0:
-                        fd.pwr_max = int(avail * ((100 - fd.electricLevel.asInt) * fd.charge_limit) / weight) if weight < 0 else fd.charge_start
-                        limit -= fd.charge_limit
-                        if limit > avail - fd.pwr_max:
-                            fd.pwr_max = max(avail - limit, avail)
-                        fd.pwr_max = max(fd.pwr_max, fd.charge_limit)
-                        avail -= fd.pwr_max
+                for fd, fd_weight in active:
+                    fd.pwr_max = int(avail * fd_weight / weight) if weight < 0 else fd.charge_start
+                    limit -= fd.charge_limit
+                    if limit > avail - fd.pwr_max:
+                        fd.pwr_max = max(avail - limit, avail)
+                    fd.pwr_max = max(fd.pwr_max, fd.charge_limit)
+                    avail -= fd.pwr_max
 
         return d.pwr_max
 
@@ -56,18 +59,19 @@ class FuseGroup:
             else:
                 limit = 0
                 weight = 0
+                active: list[tuple[ZendureDevice, int]] = []
                 for fd in self.devices:
                     if fd.homeOutput.asInt > 0:
+                        active.append((fd, fd_weight := fd.electricLevel.asInt * fd.discharge_limit))
                         limit += fd.discharge_limit
-                        weight += fd.electricLevel.asInt * fd.discharge_limit
+                        weight += fd_weight
                 avail = min(self.maxpower, limit)
-                for fd in self.devices:
-                    if fd.homeOutput.asInt > 0:
-                        fd.pwr_max = int(avail * (fd.electricLevel.asInt * fd.discharge_limit) / weight) if weight > 0 else fd.discharge_start
-                        limit -= fd.discharge_limit
-                        if limit < avail - fd.pwr_max:
-                            fd.pwr_max = min(avail - limit, avail)
-                        fd.pwr_max = min(fd.pwr_max, fd.discharge_limit)
-                        avail -= fd.pwr_max
+                for fd, fd_weight in active:
+                    fd.pwr_max = int(avail * fd_weight / weight) if weight > 0 else fd.discharge_start
+                    limit -= fd.discharge_limit
+                    if limit < avail - fd.pwr_max:
+                        fd.pwr_max = min(avail - limit, avail)
+                    fd.pwr_max = min(fd.pwr_max, fd.discharge_limit)
+                    avail -= fd.pwr_max
 
         return d.pwr_max
@@ -6,7 +6,6 @@ import asyncio
 import hashlib
 import json
 import logging
-import traceback
 from collections import deque
 from collections.abc import Callable
 from datetime import datetime, timedelta
@@ -112,6 +111,7 @@ class ZendureManager(DataUpdateCoordinator[None], EntityDevice):
         self.power = ZendureSensor(self, "power", None, "W", "power", "measurement", 0)
 
         # load devices
+        auto_mqtt = self.config_entry.data.get(CONF_AUTO_MQTT_USER, False)
         for dev in data["deviceList"]:
             try:
                 if (deviceId := dev["deviceKey"]) is None or (prodModel := dev["productModel"]) is None:
@@ -130,7 +130,6 @@ class ZendureManager(DataUpdateCoordinator[None], EntityDevice):
                 Api.devices[deviceId] = device
 
                 # Check if we should automatically manage MQTT users (opt-in)
-                auto_mqtt = self.config_entry.data.get(CONF_AUTO_MQTT_USER, False)
                 if auto_mqtt and Api.localServer is not None and Api.localServer != "":
                     try:
                         psw = hashlib.md5(deviceId.encode()).hexdigest().upper()[8:24]  # noqa: S324
@@ -152,9 +151,8 @@ class ZendureManager(DataUpdateCoordinator[None], EntityDevice):
                 elif auto_mqtt:
                     _LOGGER.debug("Skipping auto MQTT user creation for %s: Local server not configured.", deviceId)
 
-            except Exception as e:
-                _LOGGER.error("Unable to create device %s!", e)
-                _LOGGER.error(traceback.format_exc())
+            except Exception:
+                _LOGGER.exception("Unable to create device %s!", dev.get("deviceKey"))
 
         self.devices = list(Api.devices.values())
         _LOGGER.info("Loaded %s devices", len(self.devices))
@@ -206,8 +204,8 @@ class ZendureManager(DataUpdateCoordinator[None], EntityDevice):
                     fuseGroups[device.deviceId] = fg
             except AttributeError as err:
                 _LOGGER.error("Device %s missing fuseGroup attribute: %s", device.name, err)
-            except Exception as err:
-                _LOGGER.error("Unable to create fusegroup for device %s (%s): %s", device.name, device.deviceId, err, exc_info=True)
+            except Exception:
+                _LOGGER.exception("Unable to create fusegroup for device %s (%s)", device.name, device.deviceId)
 
         # Update the fusegroups and select optins for each device
         for device in self.devices:
@@ -228,8 +226,8 @@ class ZendureManager(DataUpdateCoordinator[None], EntityDevice):
                 device.fuseGroup.setDict(fusegroups)
             except AttributeError as err:
                 _LOGGER.error("Device %s missing fuseGroup attribute: %s", device.name, err)
-            except Exception as err:
-                _LOGGER.error("Unable to update fusegroup options for device %s (%s): %s", device.name, device.deviceId, err, exc_info=True)
+            except Exception:
+                _LOGGER.exception("Unable to update fusegroup options for device %s (%s)", device.name, device.deviceId)
 
         # Add devices to fusegroups
         for device in self.devices:
@@ -292,9 +290,13 @@ class ZendureManager(DataUpdateCoordinator[None], EntityDevice):
                         break
 
             _LOGGER.debug("Update device: %s (%s)", device.name, device.deviceId)
-            await device.dataRefresh(self.update_count)
+
+        # refresh the devices concurrently, so a slow zenSDK request does not hold up the others
+        await asyncio.gather(*(device.dataRefresh(self.update_count) for device in self.devices))
+        for device in self.devices:
             if device.hemsState.is_on and (time - device.hemsStateUpdated).total_seconds() > SmartMode.HEMSOFF_TIMEOUT:
                 device.hemsState.update_value(0)
+                device.lastValues.pop("hemsState", None)
             device.setStatus()
         self.update_count += 1
         self.totalKwh.update_value(kwh)
@@ -409,13 +411,12 @@ class ZendureManager(DataUpdateCoordinator[None], EntityDevice):
                 for fg in self.fuseGroups:
                     fg.initPower = True
                 await self.powerChanged(p1, isFast, time)
-            except Exception as err:
-                _LOGGER.error(err)
-                _LOGGER.error(traceback.format_exc())
+            except Exception:
+                _LOGGER.exception("Unable to update power distribution")
 
             time = datetime.now()
-            self.zero_next = time + timedelta(seconds=SmartMode.TIMEZERO)
-            self.zero_fast = time + timedelta(seconds=SmartMode.TIMEFAST)
+            self.zero_next = time + SmartMode.TIMEZERO
+            self.zero_fast = time + SmartMode.TIMEFAST
 
     async def powerChanged(self, p1: int, isFast: bool, time: datetime) -> None:
         """Return the distribution setpoint."""
@@ -423,8 +424,9 @@ class ZendureManager(DataUpdateCoordinator[None], EntityDevice):
         setpoint = p1
         power = 0
 
-        for d in self.devices:
-            if await d.power_get():
+        # read the zenSDK devices concurrently, the power distribution waits for all of them
+        for d, online in zip(self.devices, await asyncio.gather(*(d.power_get() for d in self.devices)), strict=True):
+            if online:
                 # get power production
                 d.pwr_produced = min(0, d.batteryOutput.asInt + d.homeInput.asInt - d.batteryInput.asInt - d.homeOutput.asInt)
                 self.produced -= d.pwr_produced
@@ -1,7 +1,6 @@
 """Interfaces with the Zendure Integration api sensors."""
 
 import logging
-import traceback
 from collections.abc import Callable
 from datetime import datetime
 from typing import Any
@@ -63,14 +62,13 @@ class ZendureSensor(EntityZendure, SensorEntity):
 
             if self.hass and new_value != self._attr_native_value:
                 self._attr_native_value = new_value
-                if self.hass and self.hass.loop.is_running():
-                    self.schedule_update_ha_state()
+                if self.hass is not None:
+                    self.async_write_ha_state()
                 return True
 
-        except Exception as err:
+        except Exception:
             self._attr_native_value = value
-            _LOGGER.error("Error %s setting state: %s => %s", err, self._attr_unique_id, value)
-            _LOGGER.error(traceback.format_exc())
+            _LOGGER.exception("Error setting state: %s => %s", self._attr_unique_id, value)
         return False
 
     @property
@@ -125,6 +123,10 @@ class ZendureRestoreSensor(ZendureSensor, RestoreEntity):
         if (self.last_reset is None or self.last_reset.date() != time.date()) and self.state_class != "total_increasing":
             self._attr_native_value = 0.0
             self._attr_last_reset = time
+        elif value == 0 and self.last_value == 0:
+            # nothing to add since the last update, just restart the interval
+            self.lastValueUpdate = time
+            return
         else:
             try:
                 kWh = self.last_value * (time.timestamp() - self.lastValueUpdate.timestamp()) / 3600000
@@ -137,8 +139,8 @@ class ZendureRestoreSensor(ZendureSensor, RestoreEntity):
 
         self.last_value = value
         self.lastValueUpdate = time
-        if self.hass and self.hass.loop.is_running():
-            self.schedule_update_ha_state()
+        if self.hass is not None:
+            self.async_write_ha_state()
 
 
 class ZendureCalcSensor(ZendureSensor):
@@ -162,16 +164,15 @@ class ZendureCalcSensor(ZendureSensor):
         try:
             new_value = self._value_template.async_render_with_possible_json_value(value, None) if self._value_template is not None else value
 
-            if self.hass and new_value != self._attr_native_value and self.calculate is not None:
-                self._attr_native_value = self.calculate(new_value)
-                if self.hass and self.hass.loop.is_running():
-                    self.schedule_update_ha_state()
+            if self.hass and self.calculate is not None and (new_value := self.calculate(new_value)) != self._attr_native_value:
+                self._attr_native_value = new_value
+                if self.hass is not None:
+                    self.async_write_ha_state()
                 return True
 
-        except Exception as err:
+        except Exception:
             self._attr_native_value = value
-            _LOGGER.error("Error %s setting state: %s => %s", err, self._attr_unique_id, value)
-            _LOGGER.error(traceback.format_exc())
+            _LOGGER.exception("Error setting state: %s => %s", self._attr_unique_id, value)
         return False
 
     def calculate_version(self, value: Any) -> Any:
@@ -188,3 +189,7 @@ class ZendureCalcSensor(ZendureSensor):
             self.device.updateVersion(version)
 
         return version
+
+    def calculate_temperature(self, value: Any) -> Any:
+        """Calculate the temperature in °C from the value in 0.1 K."""
+        return (float(value) - 2731) / 10
@@ -48,16 +48,22 @@ class ZendureSwitch(EntityZendure, SwitchEntity):
 
     def update_value(self, value: Any) -> bool:
         try:
-            is_on = bool(int(self._value_template.async_render_with_possible_json_value(value, None)) != 0 if self._value_template is not None else int(value) != 0)
+            if self._value_template is not None:
+                is_on = int(self._value_template.async_render_with_possible_json_value(value, None)) != 0
+            elif isinstance(value, (int, bool)):
+                is_on = value != 0
+            else:
+                is_on = int(value) != 0
 
             if self._attr_is_on == is_on:
                 return False
 
-            _LOGGER.info("Update switch: %s => %s", self._attr_unique_id, is_on)
+            if _LOGGER.isEnabledFor(logging.INFO):
+                _LOGGER.info("Update switch: %s => %s", self._attr_unique_id, is_on)
 
             self._attr_is_on = is_on
-            if self.hass and self.hass.loop.is_running():
-                self.schedule_update_ha_state()
+            if self.hass is not None:
+                self.async_write_ha_state()
         except Exception as err:
             _LOGGER.error("Error %s setting state: %s => %s", err, self._attr_unique_id, value)
         return True